@@ -115,7 +115,7 @@ def generate_scripted_session(logfile, outfile=None):
         with open(logfile) as f:
             for line in f.readlines():
                 entry = line.split("Incoming message: ")
-                if len(entry) is not 2:
+                if len(entry) != 2:
                     continue
                 messages.append(json.loads(entry[-1]))
 
@@ -91,6 +91,13 @@ if False:
         for view in views:
             conn.execute('CREATE VIEW IF NOT EXISTS {:s} AS {:s}'.format(view, views[view]))
 
+# Use write-ahead logging so each logged record doesn't have to sync a rollback
+# journal. The journal mode is stored in the database file, so the handler's
+# own connection picks it up.
+conn = sqlite3.connect(log_path)
+conn.execute("PRAGMA journal_mode=WAL")
+conn.close()
+
 # Start log server process
 log_args = ([SQLiteHandler(log_path)],)
 log_process = Process(target=logserver.run_server, args=log_args,
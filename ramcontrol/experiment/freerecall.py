@@ -74,9 +74,8 @@ class FRExperiment(WordTask):
 
             # Write .lst files to session folders (used in TotalRecall
             # during annotation).
-            for listno in sorted(assigned.listno.unique()):
+            for listno, entries in assigned.groupby("listno"):
                 name = "{:d}.lst".format(listno)
-                entries = assigned[assigned.listno == listno]
                 entries.word.to_csv(osp.join(session_dir, name), index=False,
                                     header=False, encoding='latin1')
 
@@ -156,14 +155,14 @@ class FRExperiment(WordTask):
 
             # check that phase type assignments are correct
             phase_type = words.type.iloc[0]
-            assert all(words.type == phase_type)
+            assert (words.type == phase_type).all()
 
             with self.state_context("TRIAL", listno=listno, phase_type=phase_type):
                 self.log_event("TRIAL", listno=listno, phase_type=phase_type)  # FIXME: host should get this with state message
                 self.controller.send(TrialMessage(listno))
 
                 # Countdown to encoding
-                num = "practice trial" if listno is 0 else "trial {:d}".format(
+                num = "practice trial" if listno == 0 else "trial {:d}".format(
                     listno)
                 self.run_wait_for_keypress("Press any key for {:s}".format(num))
                 self.run_countdown()
@@ -157,10 +157,9 @@ class PALExperiment(WordTask):
 
             # Write .lst files to session folders (used in TotalRecall
             # during annotation).
-            for listno in sorted(assigned.listno.unique()):
+            for listno, entries in assigned.groupby("listno"):
                 for i in range(self.config.n_pairs):
                     name = "{:d}_{:d}.lst".format(listno,i)
-                    entries = assigned[assigned.listno == listno]
                     with codecs.open(osp.join(session_dir, name), 'w', encoding="latin1") as f:
                         f.writelines(row.word1 + "\n" +row.word2 + "\n" for _, row in entries.iterrows())
 
@@ -226,14 +225,14 @@ class PALExperiment(WordTask):
 
             # check that phase type assignments are correct
             phase_type = words.type.iloc[0]
-            assert all(words.type == phase_type)
+            assert (words.type == phase_type).all()
 
             with self.state_context("TRIAL", listno=listno, phase_type=phase_type):
                 self.log_event("TRIAL", listno=listno, phase_type=phase_type)  # FIXME: host should get this with state message
                 self.controller.send(TrialMessage(listno))
 
                 # Countdown to encoding
-                num = "practice trial" if listno is 0 else "trial {:d}".format(
+                num = "practice trial" if listno == 0 else "trial {:d}".format(
                     listno)
                 self.run_wait_for_keypress("Press any key for {:s}".format(num))
                 self.run_countdown()
@@ -11,6 +11,24 @@ from pyepl.convenience import waitForAnyKey
 
 class WordTask(Experiment):
     """Class for "word"-based tasks (e.g., free recall)."""
+    def __init__(self, *args, **kwargs):
+        # Created on first use; see :attr:`recall_start_text`
+        self._recall_start_text = None
+
+        super(WordTask, self).__init__(*args, **kwargs)
+
+        # Movie paths don't change within a session, so resolve them up front
+        # instead of right before playback.
+        # FIXME: update when there are non-English videos
+        # language = self.language[:2].upper()
+        language = "EN"
+        video_path = osp.expanduser(self.kwargs["video_path"])
+        self._movie_paths = {
+            "intro": absjoin(video_path,
+                             self.config.introMovie.format(language=language)),
+            "countdown": absjoin(video_path, self.config.countdownMovie)
+        }
+
     def define_state_variables(self):
         """Defines the following state variables:
 
@@ -69,6 +87,17 @@ class WordTask(Experiment):
         assert isinstance(new_blocks, list)
         self.update_state(all_learning_blocks=new_blocks)
 
+    @property
+    def recall_start_text(self):
+        """The text shown before retrieval periods. This is the same for every
+        list, so it is only rendered once per session.
+
+        """
+        if self._recall_start_text is None:
+            self._recall_start_text = Text(self.config.recallStartText,
+                                           size=self.config.wordHeight)
+        return self._recall_start_text
+
     def reset_state(self):
         self.list_index = 0
 
@@ -114,12 +143,8 @@ class WordTask(Experiment):
 
         """
         with self.state_context("INSTRUCT"):
-            # FIXME: update when there are non-English videos
-            # language = self.language[:2].upper()
-            language = "EN"
-            filename = absjoin(osp.expanduser(self.kwargs["video_path"]),
-                               self.config.introMovie.format(language=language))
-            self.epl_helpers.play_intro_movie(filename, allow_skip=allow_skip)
+            self.epl_helpers.play_intro_movie(self._movie_paths["intro"],
+                                              allow_skip=allow_skip)
 
     @skippable
     def run_confirm(self, text):
@@ -136,9 +161,7 @@ class WordTask(Experiment):
         """Display the countdown movie."""
         self.video.clear('black')
         with self.state_context("COUNTDOWN"):
-            filename = absjoin(osp.expanduser(self.kwargs["video_path"]),
-                               self.config.countdownMovie)
-            self.epl_helpers.play_movie_sync(filename)
+            self.epl_helpers.play_movie_sync(self._movie_paths["countdown"])
 
     @skippable
     def run_wait_for_keypress(self, text):
@@ -225,9 +248,7 @@ class WordTask(Experiment):
 
         if not (self.debug and self.kwargs.get("skip_orient", False)):
             with self.state_context("RETRIEVAL_ORIENT"):
-                start_text = self.video.showCentered(
-                    Text(self.config.recallStartText,
-                         size=self.config.wordHeight))
+                start_text = self.video.showCentered(self.recall_start_text)
                 self.video.updateScreen(self.clock)
                 self.epl_helpers.play_start_beep()
                 self.clock.delay(self.config.PauseBeforeRecall)
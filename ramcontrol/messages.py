@@ -164,8 +164,8 @@ message_types = {
     name.split("Message")[0].upper(): getattr(_mod, name)
     for name in _names
     if inspect.isclass(getattr(_mod, name))
-    and name is not "RAMMessage"
-    and name is not "ExperimentNameMessage"  # this is named differently than the message
+    and name != "RAMMessage"
+    and name != "ExperimentNameMessage"  # this is named differently than the message
 }
 message_types["EXPNAME"] = ExperimentNameMessage
 
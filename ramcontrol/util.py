@@ -1,5 +1,6 @@
 """Common utilities."""
 
+import io
 import sys
 import os.path as osp
 import subprocess
@@ -8,8 +9,39 @@ import random
 from string import ascii_uppercase
 from datetime import datetime
 from contextlib import contextmanager
+from functools import wraps
 
+try:
+    unichr
+    xrange
+except NameError:  # Python 3
+    unichr = chr
+    xrange = range
 
+# Maps combining character code points to None for use with translate; see
+# :func:`remove_accents`
+_combining_table = None
+
+
+def memoize(func):
+    """Decorator to cache the return values of a function of hashable
+    positional arguments.
+
+    """
+    cache = {}
+
+    @wraps(func)
+    def wrapper(*args):
+        try:
+            return cache[args]
+        except KeyError:
+            result = cache[args] = func(*args)
+            return result
+
+    return wrapper
+
+
+@memoize
 def git_root():
     """Return the path to the root git directory."""
     path = subprocess.check_output("git rev-parse --show-toplevel".split())
@@ -21,14 +53,16 @@ def data_path():
     return osp.join(git_root(), "tests", "data")
 
 
+@memoize
 def get_instructions(filename):
     """Returns instructions stored in a text file.
 
     :param str filename: Filename to load.
 
     """
-    with open(osp.join(git_root(), "ramcontrol", "instructions", filename)) as f:
-        return f.read().decode('utf-8')
+    path = osp.join(git_root(), "ramcontrol", "instructions", filename)
+    with io.open(path, encoding='utf-8') as f:
+        return f.read()
 
 
 def absjoin(*paths):
@@ -49,8 +83,16 @@ def remove_accents(input_str):
     :rtype: str
 
     """
+    global _combining_table
+
+    if _combining_table is None:
+        _combining_table = dict.fromkeys(
+            c for c in xrange(sys.maxunicode + 1)
+            if unicodedata.combining(unichr(c))
+        )
+
     nkfd_form = unicodedata.normalize('NFKD', input_str)
-    return u"".join([c for c in nkfd_form if not unicodedata.combining(c)])
+    return nkfd_form.translate(_combining_table)
 
 
 def make_env(no_host=False, voiceserver=False, ps4=False):
@@ -82,14 +124,32 @@ def tee(filename):
     try:
         with open(filename, 'a+') as logfile:
             class Tee(object):
+                def __init__(self):
+                    self.partial = ''  # incomplete line not yet logged
+
                 def write(self, what):
-                    logfile.write('\n' + datetime.now().isoformat() + '\n' + what)
                     stdout.write(what)
 
+                    # Timestamp complete lines only rather than every write
+                    lines = (self.partial + what).split('\n')
+                    self.partial = lines.pop()
+                    if lines:
+                        stamp = datetime.now().isoformat()
+                        logfile.write(''.join(stamp + ' ' + line + '\n'
+                                              for line in lines))
+
+                def flush_partial(self):
+                    if self.partial:
+                        logfile.write(datetime.now().isoformat() + ' ' +
+                                      self.partial + '\n')
+
             logger = Tee()
             sys.stdout = logger
             sys.stderr = logger
-            yield
+            try:
+                yield
+            finally:
+                logger.flush_partial()
     finally:
         sys.stdout = stdout
         sys.stderr = stderr
@@ -7,26 +7,82 @@ PyAudio relies on portaudio. To install on mac::
   $ brew install portaudio
   $ CPATH=/usr/local/include LIBRARY_PATH=/usr/local/lib pip install pyaudio
 
+The speech detection state machine is compiled with numba when it is
+installed (this is optional)::
+
+  $ conda install numba
+
 """
 
 from __future__ import print_function, division
 
 import time
 from argparse import ArgumentParser
-from multiprocessing import Process, Queue, Event, Pipe
+from multiprocessing import Process, Event, Pipe
 from threading import Thread
 import logging
 import wave
 import traceback
 
+import numpy as np
 from pyaudio import PyAudio, paInt16
 from webrtcvad import Vad
 from logserver import create_logger
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 from . import ipc
 
 SAMPLE_RATE = 32000
-FRAMES_PER_BUFFER = 4096
+FRAMES_PER_BUFFER = 6 * SAMPLE_RATE * 20 // 1000  # six 20 ms VAD frames
+
+
+@njit(cache=True)
+def scan_speech(speech, consecutive, speaking):
+    """Run the vocalization state machine over the VAD results of one chunk
+    of audio. A vocalization starts once ``consecutive`` frames in a row
+    register as speech and ends at the next frame that does not.
+
+    :param np.ndarray speech: VAD result for each frame (nonzero for speech).
+    :param int consecutive: Number of speech frames in a row required to start
+        a vocalization.
+    :param bool speaking: True if a vocalization was ongoing before the chunk.
+    :returns: transitions, speaking where transitions is an array of
+        ``(frame index, state)`` rows (for starts, the index is the first frame
+        of the run of speech) and speaking is the state at the end of the
+        chunk.
+
+    When numba is available this is compiled on its first call. The on-disk
+    cache can't be relied on (the package directory may be read-only), so
+    :meth:`VoiceServer.run` calls it once before any audio stream is opened to
+    keep compilation out of the capture loop.
+
+    """
+    transitions = np.empty((speech.shape[0], 2), dtype=np.int64)
+    n_transitions = 0
+    run_length = 0
+
+    for i in range(speech.shape[0]):
+        if speech[i]:
+            run_length += 1
+            if run_length >= consecutive and not speaking:
+                speaking = True
+                transitions[n_transitions, 0] = i - run_length + 1
+                transitions[n_transitions, 1] = 1
+                n_transitions += 1
+        else:
+            if speaking:
+                speaking = False
+                transitions[n_transitions, 0] = i
+                transitions[n_transitions, 1] = 0
+                n_transitions += 1
+            run_length = 0
+
+    return transitions[:n_transitions], speaking
 
 
 class VoiceServer(Process):
@@ -41,10 +97,13 @@ class VoiceServer(Process):
     :param str filename: WAV file to read for testing (doesn't use microphone).
         Note that this will actually play the WAV file.
     :param int loglevel: Logging level to use. If None, assume ``logging.INFO``.
+    :param float energy_threshold: When given, frames with an RMS amplitude
+        below this (in 16-bit sample units) are treated as silence without
+        running them through the VAD. None (the default) disables this.
 
     """
     def __init__(self, pipe, vad_level=3, consecutive_frames=3, filename=None,
-                 loglevel=logging.INFO):
+                 loglevel=logging.INFO, energy_threshold=None):
         super(VoiceServer, self).__init__()
 
         self.pipe = pipe
@@ -53,60 +112,84 @@ class VoiceServer(Process):
         self.filename = filename
         self.logger = logging.getLogger()  # to be redefined once the process starts; tests fail otherwise
         self.loglevel = loglevel
+        self.energy_threshold = energy_threshold
 
-        self.data_queue = Queue()
         self.stop_stream = Event()
         self.done = Event()
 
-    def check_for_speech(self, frame_duration_ms=20):
+    def check_for_speech(self, chunks, frame_duration_ms=20):
         """Checks for speech.
 
+        :param chunks: Iterable of chunks of 16-bit mono audio as read by
+            :meth:`read_audio_stream`.
         :param int frame_duration_ms: Audio frame length in ms.
 
         """
         vad = Vad(self.vad_aggressiveness)
         speaking = False  # to keep track of if vocalization ongoing
 
-        n = int(SAMPLE_RATE * (frame_duration_ms / 1000.) * 2)
+        n = SAMPLE_RATE * frame_duration_ms * 2 // 1000  # bytes per frame
         # duration = n / SAMPLE_RATE / 2.0
 
         last_timestamp_sent = 0
 
-        while not self.done.is_set():
-            chunk = self.data_queue.get()
-
-            offset = 0
-            framecount = []
-            while offset + n < len(chunk):
-                now = time.time() * 1000.0  # caveat: this is not the same as PyEPL's clock...
-                frame = chunk[offset:offset + n]
-                if vad.is_speech(frame, SAMPLE_RATE):
-                    framecount.append({"timestamp": now})
-
-                    if len(framecount) >= self.consecutive_frames and not speaking:
-                        speaking = True
-                        payload = {
-                            "speaking": True,
-                            "timestamp": framecount[0]["timestamp"]
-                        }
-                        self.pipe.send(ipc.message("VOCALIZATION", payload))
-                        self.logger.debug("Started speaking at %f", now)
-                else:
-                    if speaking:
-                        speaking = False
-                        payload = {
-                            "speaking": False,
-                            "timestamp": now
-                        }
-                        self.pipe.send(ipc.message("VOCALIZATION", payload))
-                        self.logger.debug("Stopped speaking at %f", now)
-                    framecount = []
-
-                offset += n
-
-            now = time.time() * 1000
+        # Avoid paying for filtered debug messages in the frame loop
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+
+        # Local aliases to avoid repeated attribute/global lookups per frame
+        is_speech = vad.is_speech
+        rate = SAMPLE_RATE
+        clock = time.time
+        send = self.pipe.send
+        message = ipc.message
+        log_debug = self.logger.debug
+        consecutive = self.consecutive_frames
+        energy_threshold = self.energy_threshold
+
+        # Per-frame result arrays, reused for as long as the chunk size stays
+        # the same
+        speech = loud = None
+
+        for chunk in chunks:
+            # The chunk has only just been fully captured, so read the clock
+            # before doing any work on it; frame times are counted back from
+            # this by their position in the chunk
+            now = clock() * 1000.0  # caveat: this is not the same as PyEPL's clock...
+
+            # webrtcvad accepts any buffer, so frames can be passed as views
+            # into the chunk instead of being copied out of it
+            frames = memoryview(chunk)
+            nframes = len(chunk) // n
+            offsets = range(0, nframes * n, n)
+
+            if speech is None or len(speech) != nframes:
+                speech = np.empty(nframes, dtype=np.uint8)
+                loud = np.ones(nframes, dtype=bool)
+
+            if energy_threshold is not None:
+                samples = np.frombuffer(chunk, dtype=np.int16)[:nframes * (n // 2)]
+                samples = samples.reshape(nframes, n // 2).astype(np.float64)
+                loud = np.sqrt((samples ** 2).mean(axis=1)) >= energy_threshold
+
+            for i, offset in enumerate(offsets):
+                speech[i] = loud[i] and is_speech(frames[offset:offset + n], rate)
+
+            transitions, speaking = scan_speech(speech, consecutive, speaking)
+
+            chunk_start = now - nframes * frame_duration_ms
+            for index, state in transitions:
+                payload = {
+                    "speaking": bool(state),
+                    "timestamp": chunk_start + index * frame_duration_ms
+                }
+                send(message("VOCALIZATION", payload))
+                if debug:
+                    log_debug("%s speaking at %f",
+                              "Started" if state else "Stopped",
+                              payload["timestamp"])
+
             if now - last_timestamp_sent >= 1000:
-                self.pipe.send(ipc.message("TIMESTAMP", dict(timestamp=now)))
+                send(message("TIMESTAMP", dict(timestamp=now)))
                 last_timestamp_sent = now
 
     def quit(self):
@@ -153,41 +236,48 @@ class VoiceServer(Process):
             raise
 
     def read_audio_stream(self, stream, wav=None):
-        """Reads from the audio stream and queues data for VAD.
+        """Reads from the audio stream until asked to stop.
 
         :param stream: Audio input stream.
         :param wav: Wave data for writing to stream (if simulating).
+        :returns: Generator of audio chunks.
 
         """
-        while not self.stop_stream.is_set():
-            try:
-                if wav is None:
-                    data = stream.read(FRAMES_PER_BUFFER)
-                else:
-                    data = wav.readframes(FRAMES_PER_BUFFER)
-                    if len(data) is 0:
-                        continue
-                    stream.write(data)
-                self.data_queue.put(data)
-            except IOError:
-                # TODO: real error handling
-                self.logger.critical("Exception in voiceserver", exc_info=True)
-                self.pipe.send(ipc.critical_error_message("IOError"))
-            except:
-                self.logger.error("Unknown error", exc_info=True)
-
-        stream.close()
-        self.stop_stream.clear()
+        try:
+            while not self.stop_stream.is_set():
+                try:
+                    if wav is None:
+                        # VAD runs on this thread between reads, so a late
+                        # read must not turn into a fatal IOError
+                        data = stream.read(FRAMES_PER_BUFFER,
+                                           exception_on_overflow=False)
+                    else:
+                        data = wav.readframes(FRAMES_PER_BUFFER)
+                        if not data:
+                            continue
+                        stream.write(data)
+                except IOError:
+                    # TODO: real error handling
+                    self.logger.critical("Exception in voiceserver", exc_info=True)
+                    self.pipe.send(ipc.critical_error_message("IOError"))
+                    continue
+                except:
+                    self.logger.error("Unknown error", exc_info=True)
+                    continue
+
+                yield data
+        finally:
+            stream.close()
+            self.stop_stream.clear()
 
     def run(self):
         self.logger = create_logger("voiceserver", level=self.loglevel)
 
-        audio = PyAudio()
+        # Compile the state machine now rather than on the first chunk of audio
+        scan_speech(np.zeros(1, dtype=np.uint8), 1, False)
 
-        vad_thread = Thread(target=self.check_for_speech)
-        vad_thread.daemon = True
-        vad_thread.start()
-        mic_thread = None  # later, the thread to read from the mic
+        audio = PyAudio()
+        mic_thread = None  # later, the thread to read from the mic and run VAD
 
         while not self.done.is_set():
             try:
@@ -199,8 +289,9 @@ class VoiceServer(Process):
                 if msg["type"] == "START":
                     self.logger.info("Got request to start VAD")
                     stream, wav = self.open_audio_stream(audio)
-                    mic_thread = Thread(target=self.read_audio_stream,
-                                        args=(stream, wav))
+                    chunks = self.read_audio_stream(stream, wav)
+                    mic_thread = Thread(target=self.check_for_speech,
+                                        args=(chunks,))
                     mic_thread.start()
                     self.pipe.send(ipc.message("STARTED"))
 
@@ -234,6 +325,9 @@ def main():
                         help="File to write VAD events to (overwrites existing)")
     parser.add_argument("-l", "--loglevel", choices=levels, default="info",
                         help="Log level")
+    parser.add_argument("-e", "--energy-threshold", default=None, type=float,
+                        help="RMS amplitude (16-bit units) below which frames "
+                             "are treated as silence without running VAD")
 
     args = parser.parse_args()
 
@@ -243,7 +337,8 @@ def main():
 
     parent, child = Pipe()
     p = VoiceServer(child, filename=args.filename,
-                    loglevel=levels[args.loglevel])
+                    loglevel=levels[args.loglevel],
+                    energy_threshold=args.energy_threshold)
     p.start()
 
     parent.send(ipc.message("START"))
@@ -1,6 +1,6 @@
 import time
 import json
-from six.moves.queue import Queue
+from collections import deque
 
 import zmq
 from logserver import create_logger
@@ -31,8 +31,9 @@ class SocketServer(object):
         self.poller = zmq.Poller()
         self.poller.register(self.sock, zmq.POLLIN)
 
-        # Outgoing message queue
-        self._out_queue = Queue()
+        # Outgoing message queue (appends and pops on a deque are atomic, so
+        # no further locking is needed)
+        self._out_queue = deque()
 
         # time of last sent heartbeat message
         self._last_heartbeat = 0.
@@ -43,7 +44,6 @@ class SocketServer(object):
     def join(self):
         """Block until all outgoing messages have been processed."""
         self.logger.warning("Joining doesn't work yet; doing nothing...")
-        # self._out_queue.join()
 
     def bind(self, address="tcp://*:8889"):
         """Bind the socket to start listening for connections.
@@ -66,7 +66,7 @@ class SocketServer(object):
 
     def enqueue_message(self, msg):
         """Submit a new outgoing message to the queue."""
-        self._out_queue.put_nowait(msg)
+        self._out_queue.append(msg)
 
     def send(self, msg):
         """Immediately transmit a message to the host PC. It is advisable to not
@@ -97,8 +97,13 @@ class SocketServer(object):
         message["in_or_out"] = "in" if incoming else "out"
         self.logger.info("%s", json.dumps(message))
 
-    def handle_incoming(self):
-        events = self.poller.poll(1)
+    def handle_incoming(self, timeout=0):
+        """Receive and dispatch a pending message, if any.
+
+        :param int timeout: Time in ms to wait for a message to arrive.
+
+        """
+        events = self.poller.poll(timeout)
         if self.sock in dict(events):
             try:
                 msg = self.sock.recv_json()
@@ -115,20 +120,23 @@ class SocketServer(object):
                     continue
 
     def handle_outgoing(self):
+        queue = self._out_queue
         try:
-            while not self._out_queue.empty():
-                msg = self._out_queue.get_nowait()
-                self.send(msg)
-                self._out_queue.task_done()  # so we can join the queue elsewhere
+            while queue:
+                self.send(queue.popleft())
         except:
             self.logger.error("Error in outgoing message processing",
                               exc_info=True)
 
-    def update(self):
+    def update(self, timeout=0):
         """Call periodically to check for incoming messages and/or send messages
         in the outgoing queue.
 
+        :param int timeout: Time in ms to wait for an incoming message. The
+            default of 0 does not block, since this is run as a PyEPL poll
+            callback alongside everything else in the main loop.
+
         """
-        self.handle_incoming()
+        self.handle_incoming(timeout)
         self.handle_outgoing()
 
@@ -9,12 +9,17 @@ from argparse import ArgumentParser
 import re
 import subprocess
 
-from prompt_toolkit import prompt
-from prompt_toolkit.history import InMemoryHistory
-from prompt_toolkit.contrib.completers import WordCompleter
-
 import ramcontrol
-from ramcontrol.util import absjoin
+
+# Paths that don't change over the life of the launcher. These are relative to
+# run.py, which run_experiment always starts from its own directory.
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(ROOT_DIR, "ramcontrol.ini")
+DATA_PATH = os.path.join(ROOT_DIR, "data")
+RAMCONTROL_PATH = os.path.dirname(ramcontrol.__file__)
+
+# A valid subject ID contains exactly one match of this
+SUBJECT_ID_REGEX = re.compile(r"R\d{4}[A-Z]")
 
 
 def get_subject(subject=""):
@@ -23,8 +28,12 @@ def get_subject(subject=""):
     :param str subject: Default option.
 
     """
+    # prompt_toolkit is slow to import, so only do so when prompting
+    from prompt_toolkit import prompt
+    from prompt_toolkit.history import InMemoryHistory
+
     history = InMemoryHistory()
-    validate = lambda s: len(re.findall(r"R\d{4}[A-Z]", s)) == 1
+    validate = lambda s: len(SUBJECT_ID_REGEX.findall(s)) == 1
     while True:
         # response = prompt(u"Subject [{}]: ".format(subject), history=history)
         response = prompt(u"Subject: ")
@@ -44,12 +53,18 @@ def get_experiment(available, experiment=""):
     :param str experiment: Default choice.
 
     """
+    if len(available) == 1:
+        return available[0].encode()
+
+    from prompt_toolkit import prompt
+    from prompt_toolkit.contrib.completers import WordCompleter
+
     completer = WordCompleter(available)
     while True:
         # response = prompt(u"Experiment (press tab to see available) [{}]: ".format(experiment),
         #                   completer=completer, complete_while_typing=True)
         response = prompt(u"Experiment (press tab to see available): ",
-                          completer=completer, complete_while_typing=True)
+                          completer=completer, complete_while_typing=False)
         if len(response) == 0 and experiment in available:
             return experiment.encode()
         elif response in available:
@@ -61,31 +76,69 @@ def get_experiment(available, experiment=""):
 
 def get_language(languages):
     """Prompt for the language to use in the experiment."""
+    if len(languages) == 1:
+        return languages[0].encode()
+
+    from prompt_toolkit import prompt
+    from prompt_toolkit.contrib.completers import WordCompleter
+
     completer = WordCompleter(languages)
     while True:
         response = prompt(u"Language (press tab to see available: ",
-                          completer=completer, complete_while_typing=True)
+                          completer=completer, complete_while_typing=False)
         if response in languages:
             return response.encode()
         else:
             print("Unavailable language")
 
 
-def main():
-    config = ConfigParser()
-    config.read("ramcontrol.ini")
+def coerce_option(value):
+    """Convert an option string from the INI file to an int, float, or bool if
+    it looks like one.
+
+    :param str value:
+
+    """
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return ConfigParser.BOOLEAN_STATES.get(value.lower(), value)
+
+
+def read_config(filename):
+    """Read the launcher configuration into plain dicts. Option values are
+    converted with :func:`coerce_option` up front so that lookups don't need
+    to.
+
+    :param str filename: Path to the INI file.
+    :returns: dict mapping section names to dicts of options.
+
+    """
+    parser = ConfigParser()
+    parser.read(filename)
+    return {section: {key: coerce_option(value)
+                      for key, value in parser.items(section)}
+            for section in parser.sections()}
 
-    parser = ArgumentParser()
-    parser.add_argument("-s", "--subject", help="Subject ID", default=None)
-    parser.add_argument("-x", "--experiment", default=None, help="Experiment to run")
-    parser.add_argument("-l", "--language",
+
+arg_parser = ArgumentParser()
+arg_parser.add_argument("-s", "--subject", help="Subject ID", default=None)
+arg_parser.add_argument("-x", "--experiment", default=None, help="Experiment to run")
+arg_parser.add_argument("-l", "--language",
                         choices=["english", "spanish"],
                         help="Language to use in experiment")
-    parser.add_argument("-d", "--debug", action="store_true", default=False,
+arg_parser.add_argument("-d", "--debug", action="store_true", default=False,
                         help="Enable debug mode")
-    parser.add_argument("--no-fs", action="store_true", default=False,
+arg_parser.add_argument("--no-fs", action="store_true", default=False,
                         help="Disable fullscreen mode")
-    args = parser.parse_args()
+
+
+def main():
+    config = read_config(CONFIG_PATH)
+
+    args = arg_parser.parse_args()
 
     experiments = config["general"]["experiments"].split()
 
@@ -105,25 +158,25 @@ def main():
     env = {
         "subject": args.subject,
         "experiment": args.experiment,
-        "experiment_family": config.get(args.experiment, "family"),
+        "experiment_family": config[args.experiment]["family"],
         "language": args.language,
 
-        "voiceserver": config[args.experiment].getboolean("voiceserver", fallback=False),
+        "voiceserver": config[args.experiment].get("voiceserver", False),
 
         "video_path": os.path.abspath(os.path.expanduser(config["videos"]["path"])),
-        "data_path": absjoin("./data"),
-        "ramcontrol_path": os.path.dirname(ramcontrol.__file__),
+        "data_path": DATA_PATH,
+        "ramcontrol_path": RAMCONTROL_PATH,
 
         "fullscreen": not (args.debug or args.no_fs),
         "debug": args.debug,
-        "debug_options": config["debug"].items()
+        "debug_options": list(config["debug"].items())
     }
 
     penv = os.environ.copy()
     penv["RAM_CONFIG"] = pickle.dumps(env)
 
     p = subprocess.Popen(["python", "-m", "ramcontrol.experiment"],
-                         cwd=absjoin("."), env=penv)
+                         cwd=ROOT_DIR, env=penv)
     p.wait()
 
 
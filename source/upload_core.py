@@ -5,6 +5,7 @@
 
 import config
 import sys, tty, os, termios, subprocess, time, urllib2, datetime, shutil
+import atexit
 
 
 def chooseFromListbox(contents, prompt = '', multiSelect = True):
@@ -383,7 +384,8 @@ def rsyncToRamtransfer(showProgress = True, getReturn = False,
     if not localDir:
         localDir = os.path.join(config.localExperimentDir, '')
     
-    if showProgress:
+    # Progress output is only useful to someone watching a terminal
+    if showProgress and sys.stdout.isatty():
         progress = '--progress'
     else:
         progress = ''
@@ -589,6 +591,17 @@ def confirm(message, yMessage = 'confirm', nMessage = 'return'):
 
     return ch == 'y'
 
+def unmountPC():
+    """
+    Unmount the control PC if it is mounted
+    """
+    if os.path.ismount(config.PCMountPoint):
+        os.system('umount %s'%config.PCMountPoint)
+
+# The mount is kept between transfers, so make sure it doesn't outlive the
+# program however it exits
+atexit.register(unmountPC)
+
 def mountPC():
     """
     Mount the control PC
@@ -596,6 +609,18 @@ def mountPC():
     returns True if completed sucessfully, False otherwise
     """
 
+    # Reuse the mount from an earlier transfer if the share is still readable;
+    # otherwise drop the stale mount and go through the usual steps
+    if os.path.ismount(config.PCMountPoint):
+        try:
+            reachable = os.listdir(config.PCMountPoint) != []
+        except OSError:
+            reachable = False
+        if reachable:
+            print('Control PC already mounted')
+            return True
+        unmountPC()
+
     # Make sure user wants to be here
     if not confirm('Must mount Control PC to continue.',
             'confirm Control PC is connected', 
@@ -669,6 +694,8 @@ def transferChosenSessions(sessToTransfer):
     # Get the places to transfer to
     toSessPaths = stringToSessionPath(sessToTransfer, config.localExperimentDir)
 
+    progress = '--progress' if sys.stdout.isatty() else ''
+
     # Loop over, rsyncing each one
     for (strSess, fromSessPath, toSessPath) in zip(sessToTransfer, fromSessPaths, toSessPaths):
         line()
@@ -682,8 +709,11 @@ def transferChosenSessions(sessToTransfer):
     
         fromSessPath = os.path.join(fromSessPath)
         
-        rsyncCmd = 'rsync -av --progress \"%(from)s/\" \'%(to)s\''%\
-                {'from': fromSessPath, 'to': toSessPath}
+        # Copying from a mounted share, so skip the delta algorithm and
+        # temporary files; a partial file left by an interrupted copy keeps
+        # the wrong mtime and is redone on the next transfer
+        rsyncCmd = 'rsync -av --whole-file --inplace %(prog)s \"%(from)s/\" \'%(to)s\''%\
+                {'prog': progress, 'from': fromSessPath, 'to': toSessPath}
         
         ##### DEBUGGING:
         #print(rsyncCmd)
@@ -714,8 +744,8 @@ def transferEEG_option():
     # Trasnfer the chosen sessions
     transferChosenSessions(sessToTransfer)
 
-    # Unmount the Task PC so we can do it again later.
-    os.system('umount %s'%config.PCMountPoint)
+    # The Control PC stays mounted for further transfers; it is unmounted
+    # when quitting (see quitProgram_option)
 
     # Now get sessions with EEG again, to check what was transferred
     sessWithEEGNew = getSessionsWithEEG()
@@ -754,6 +784,7 @@ def quitProgram_option():
     Exits out of the program, and deletes any old data in the transferred folder
     """
     clear()
+    unmountPC()
     print("Please wait. Deleting old data...")
     os.system('find %s -mtime +30 -type f -exec echo {} \; -exec gshred -u {} \;'%\
             (config.transferredDir))
@@ -18,6 +18,20 @@ def logfile():
         pass
 
 
+def test_memoize():
+    calls = []
+
+    @util.memoize
+    def double(x):
+        calls.append(x)
+        return 2 * x
+
+    assert double(1) == 2
+    assert double(1) == 2
+    assert double(2) == 4
+    assert calls == [1, 2]
+
+
 def test_git_root():
     assert util.git_root() == osp.realpath(osp.join(here, ".."))
 
@@ -30,6 +44,11 @@ def test_absjoin():
     assert util.absjoin(".", "tests") == here
 
 
+def test_remove_accents():
+    assert util.remove_accents(u"\u00d1and\u00fa caf\u00e9") == u"Nandu cafe"
+    assert util.remove_accents(u"plain") == u"plain"
+
+
 def test_tee(logfile):
     stdout = sys.stdout
     stderr = sys.stderr
@@ -44,3 +63,14 @@ def test_tee(logfile):
 
     with open(logfile, 'r') as f:
         assert "testing" in f.read()
+
+
+def test_tee_timestamps_lines(logfile):
+    with util.tee(logfile):
+        sys.stdout.write("one\ntw")
+        sys.stdout.write("o\nthree")
+
+    with open(logfile, 'r') as f:
+        lines = f.read().splitlines()
+
+    assert [line.split(" ", 1)[1] for line in lines] == ["one", "two", "three"]
@@ -1,9 +1,11 @@
 import os.path as osp
 import time
 from multiprocessing import Pipe
+import numpy as np
 import pytest
 
-from ramcontrol.voiceserver import VoiceServer
+from ramcontrol import voiceserver
+from ramcontrol.voiceserver import VoiceServer, scan_speech
 from ramcontrol.util import data_path
 from ramcontrol import exc, ipc
 
@@ -17,6 +19,61 @@ def voice_server():
         server.terminate()
 
 
+def test_scan_speech():
+    speech = np.array([0, 1, 1, 0, 1, 1, 1, 1, 0, 1], dtype=np.uint8)
+    transitions, speaking = scan_speech(speech, 3, False)
+    assert transitions.tolist() == [[4, 1], [8, 0]]
+    assert not speaking
+
+    # vocalization continuing into the next chunk
+    transitions, speaking = scan_speech(speech[3:8], 3, False)
+    assert transitions.tolist() == [[1, 1]]
+    assert speaking
+
+    # ...and ending at the start of the next one
+    transitions, speaking = scan_speech(speech[8:], 3, True)
+    assert transitions.tolist() == [[0, 0]]
+    assert not speaking
+
+    transitions, speaking = scan_speech(speech[:0], 3, True)
+    assert len(transitions) == 0
+    assert speaking
+
+
+def test_energy_gate(monkeypatch):
+    frames_checked = []
+
+    class StubVad(object):
+        def __init__(self, mode):
+            pass
+
+        def is_speech(self, frame, rate):
+            frames_checked.append(frame.tobytes())
+            return True
+
+    monkeypatch.setattr(voiceserver, "Vad", StubVad)
+
+    parent, child = Pipe()
+    server = VoiceServer(child, consecutive_frames=1, energy_threshold=100)
+
+    samples_per_frame = voiceserver.SAMPLE_RATE * 20 // 1000
+    quiet = np.zeros(samples_per_frame, dtype=np.int16)
+    loud = np.full(samples_per_frame, 1000, dtype=np.int16)
+    chunk = np.concatenate([quiet, loud, quiet]).tobytes()
+    server.check_for_speech([chunk])
+
+    # only the loud frame reaches the VAD...
+    assert frames_checked == [loud.tobytes()]
+
+    # ...and the quiet frames around it count as silence
+    messages = []
+    while parent.poll():
+        messages.append(parent.recv())
+    vocalizations = [msg["data"]["speaking"] for msg in messages
+                     if msg["type"] == "VOCALIZATION"]
+    assert vocalizations == [True, False]
+
+
 class TestVoiceServer:
     def test_quit(self, voice_server):
         _, server = voice_server